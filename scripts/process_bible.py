@@ -9,8 +9,8 @@ contextual information for each chunk.
 import os
 import sys
 import logging
-import json
 import argparse
+import itertools
 import time
 from typing import Dict, List, Optional
 
@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from src.bible_kg.parser import parse_bible
 from src.bible_kg.chunker import create_chunks, BibleChunker
 from src.bible_kg.context_gen import generate_contexts, ContextGenerator
+from src.bible_kg.serialization import tee_json_array
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +33,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def positive_float(value):
+    """Parse a command line value as a number greater than zero."""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than zero, got {value}")
+    return number
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Process KJV Bible text file')
@@ -50,6 +58,13 @@ def parse_arguments():
         help='Directory to save processed data'
     )
     
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=1,
+        help='Number of processes to parse the Bible text file with'
+    )
+    
     parser.add_argument(
         '--window-size',
         type=int,
@@ -89,7 +104,41 @@ def parse_arguments():
         '--batch-size',
         type=int,
         default=5,
-        help='Number of chunks to process in a batch for context generation'
+        help='Number of chunks embedded together for the semantic cache and per progress step in context generation'
+    )
+    
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=None,
+        help='Maximum number of concurrent LLM requests (default: $OLLAMA_NUM_PARALLEL, else the batch size)'
+    )
+    
+    parser.add_argument(
+        '--max-qps',
+        type=positive_float,
+        default=None,
+        help='Maximum number of LLM requests started per second (default: no limit)'
+    )
+    
+    parser.add_argument(
+        '--context-cache',
+        type=str,
+        default=None,
+        help='Path to the on-disk cache of generated contexts (default: <output-dir>/context_cache.sqlite3)'
+    )
+    
+    parser.add_argument(
+        '--no-context-cache',
+        action='store_true',
+        help='Disable the on-disk cache of generated contexts'
+    )
+    
+    parser.add_argument(
+        '--semantic-cache-threshold',
+        type=float,
+        default=None,
+        help='Reuse the context of an earlier chunk from the same chapter when embedding similarity reaches this value (requires the embeddings extras)'
     )
     
     parser.add_argument(
@@ -98,6 +147,18 @@ def parse_arguments():
         help='Skip context generation step'
     )
     
+    parser.add_argument(
+        '--save-verses',
+        action='store_true',
+        help='Also save the parsed verses to verses.json'
+    )
+    
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Save chunks with context as JSON Lines (chunks_with_context.jsonl)'
+    )
+    
     parser.add_argument(
         '--sample-size',
         type=int,
@@ -114,28 +175,25 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(args.output_dir, exist_ok=True)
     
-    # Step 1: Parse the KJV Bible text file
+    # Step 1: Parse the KJV Bible text file. Verses are streamed straight
+    # into the chunker, so the whole Bible is never held in memory at once.
     logger.info(f"Parsing Bible text file: {args.input_file}")
     start_time = time.time()
     
-    verses = parse_bible(args.input_file)
+    verses = parse_bible(args.input_file, workers=args.parse_workers)
     
-    if args.sample_size > 0 and args.sample_size < len(verses):
+    if args.sample_size > 0:
         logger.info(f"Using sample of {args.sample_size} verses")
-        verses = verses[:args.sample_size]
-    
-    parse_time = time.time() - start_time
-    logger.info(f"Parsed {len(verses)} verses in {parse_time:.2f} seconds")
+        verses = itertools.islice(verses, args.sample_size)
     
-    # Save parsed verses
-    verses_output_path = os.path.join(args.output_dir, 'verses.json')
-    with open(verses_output_path, 'w', encoding='utf-8') as f:
-        json.dump(verses, f, indent=2)
-    logger.info(f"Saved parsed verses to {verses_output_path}")
+    # Save parsed verses as they stream past. Nothing downstream reads
+    # them, so this is opt-in.
+    if args.save_verses:
+        verses_output_path = os.path.join(args.output_dir, 'verses.json')
+        verses = tee_json_array(verses, verses_output_path)
     
     # Step 2: Create chunks
     logger.info("Creating chunks")
-    start_time = time.time()
     
     chunker = BibleChunker(
         verses=verses,
@@ -143,35 +201,58 @@ def main():
         overlap_percentage=args.overlap_percentage,
         max_passage_size=args.max_passage_size
     )
-    chunks = chunker.create_chunks()
+    chunks = chunker.iter_chunks()
     
-    chunk_time = time.time() - start_time
-    logger.info(f"Created {len(chunks)} chunks in {chunk_time:.2f} seconds")
+    # Context generation needs every chunk, so only materialize the list
+    # when that step will run
+    if not args.skip_context_generation:
+        chunks = list(chunks)
     
     # Save chunks
     chunks_output_path = os.path.join(args.output_dir, 'chunks.json')
     chunker.save_chunks(chunks, chunks_output_path)
+    if args.save_verses:
+        logger.info(f"Saved parsed verses to {verses_output_path}")
     logger.info(f"Saved chunks to {chunks_output_path}")
     
+    chunk_time = time.time() - start_time
+    logger.info(f"Parsed and chunked verses in {chunk_time:.2f} seconds")
+    
     # Step 3: Generate contextual information
     if not args.skip_context_generation:
         logger.info("Generating contextual information")
         start_time = time.time()
         
+        if args.no_context_cache:
+            cache_path = None
+        else:
+            cache_path = args.context_cache or os.path.join(args.output_dir, 'context_cache.sqlite3')
+        
         context_generator = ContextGenerator(
             llm_api_url=args.llm_api_url,
             model=args.model,
-            batch_size=args.batch_size
+            batch_size=args.batch_size,
+            cache_path=cache_path,
+            semantic_cache_threshold=args.semantic_cache_threshold,
+            concurrency=args.concurrency,
+            max_qps=args.max_qps
         )
-        chunks_with_context = context_generator.generate_contexts(chunks)
-        
-        context_time = time.time() - start_time
-        logger.info(f"Generated context for {len(chunks_with_context)} chunks in {context_time:.2f} seconds")
-        
-        # Save chunks with context
-        context_output_path = os.path.join(args.output_dir, 'chunks_with_context.json')
-        context_generator.save_chunks_with_context(chunks_with_context, context_output_path)
-        logger.info(f"Saved chunks with context to {context_output_path}")
+        try:
+            chunks_with_context = context_generator.generate_contexts(chunks)
+            
+            context_time = time.time() - start_time
+            logger.info(f"Generated context for {len(chunks_with_context)} chunks in {context_time:.2f} seconds")
+            
+            # Save chunks with context
+            if args.jsonl:
+                context_output_path = os.path.join(args.output_dir, 'chunks_with_context.jsonl')
+                context_generator.save_chunks_with_context_jsonl(chunks_with_context, context_output_path)
+            else:
+                context_output_path = os.path.join(args.output_dir, 'chunks_with_context.json')
+                context_generator.save_chunks_with_context(chunks_with_context, context_output_path)
+            logger.info(f"Saved chunks with context to {context_output_path}")
+        finally:
+            context_generator.close()
     else:
         logger.info("Skipping context generation")
     
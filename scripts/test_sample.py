@@ -49,7 +49,7 @@ Genesis 1:10 And God called the dry [land] Earth; and the gathering together of
     try:
         # Step 1: Parse the sample
         logger.info("Parsing sample Bible text")
-        verses = parse_bible(sample_file)
+        verses = list(parse_bible(sample_file))
         logger.info(f"Parsed {len(verses)} verses")
         
         # Print the first verse
@@ -69,21 +69,7 @@ Genesis 1:10 And God called the dry [land] Earth; and the gathering together of
         
         # Print the first chunk
         if chunks:
-            # Convert to a more readable format
-            readable_chunk = {
-                'chunk_id': chunks[0]['chunk_id'],
-                'reference': chunks[0]['reference'],
-                'text': chunks[0]['text'],
-                'metadata': chunks[0]['metadata'],
-                'verses': [
-                    {
-                        'reference': verse['reference'],
-                        'text': verse['text']
-                    }
-                    for verse in chunks[0]['verses']
-                ]
-            }
-            logger.info(f"First chunk: {json.dumps(readable_chunk, indent=2)}")
+            logger.info(f"First chunk: {json.dumps(chunks[0], indent=2)}")
         
         logger.info("Test completed successfully")
         
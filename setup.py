@@ -10,6 +10,7 @@ setup(
     package_dir={"": "src"},
     install_requires=[
         "requests>=2.32.0",
+        "urllib3>=1.26.0",
     ],
     extras_require={
         "dev": [
@@ -21,6 +22,9 @@ setup(
             "sentence-transformers>=2.2.0",
             "faiss-cpu>=1.7.0",
         ],
+        "fast": [
+            "orjson>=3.9.0",
+        ],
         "indexing": [
             "rank-bm25>=0.2.2",
             "numpy>=1.24.0",
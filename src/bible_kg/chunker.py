@@ -5,17 +5,42 @@ passages and sliding window chunks, implementing a hybrid chunking strategy.
 """
 
 import logging
-from typing import Dict, List, Tuple, Any
-import json
+import re
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any
 import os
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from .serialization import write_json_array
+
+# Logging is configured by the application
 logger = logging.getLogger(__name__)
 
+# Verse field accessors used on the chunking hot path
+_get_book_chapter = itemgetter('book', 'chapter')
+_get_text = itemgetter('text')
+
+
+def _make_verse_entries(verses: List[Dict]) -> List[Dict]:
+    """Build the serialized entries stored in a chunk's verse list.
+    
+    Chunks keep only each verse's reference and text.
+    
+    Args:
+        verses: List of verse objects.
+        
+    Returns:
+        A list of verse entries, in the same order.
+    """
+    return [
+        {
+            'reference': verse['reference'],
+            'text': verse['text']
+        }
+        for verse in verses
+    ]
+
+
 class BibleChunker:
     """Chunker for Bible verses.
     
@@ -23,9 +48,27 @@ class BibleChunker:
     chunking and sliding window chunking.
     """
     
+    # Common passage boundary indicators in the text
+    BOUNDARY_PHRASES = (
+        "And it came to pass",
+        "Now it came to pass",
+        "After these things",
+        "Then",
+        "Behold",
+        "Verily, verily",
+        "Thus saith the Lord"
+    )
+    
+    # Boundary phrases compiled into one alternation, so each verse is
+    # checked with a single match() at the start of its text
+    _BOUNDARY_RE = re.compile('|'.join(map(re.escape, BOUNDARY_PHRASES)))
+    
+    # Characters of a reference that become underscores in a chunk ID
+    _ID_TABLE = str.maketrans({' ': '_', ':': '_', '-': '_'})
+    
     def __init__(
         self, 
-        verses: List[Dict],
+        verses: Iterable[Dict],
         window_size: int = 7,
         overlap_percentage: float = 0.5,
         max_passage_size: int = 15
@@ -33,7 +76,8 @@ class BibleChunker:
         """Initialize the BibleChunker.
         
         Args:
-            verses: List of parsed verse objects.
+            verses: Iterable of parsed verse objects in canonical order. This
+                may be a generator, in which case it is consumed once.
             window_size: Size of the sliding window in verses.
             overlap_percentage: Percentage of overlap between adjacent windows.
             max_passage_size: Maximum size of a passage chunk before applying
@@ -47,36 +91,8 @@ class BibleChunker:
         # Calculate step size for sliding window
         self.step_size = max(1, int(window_size * (1 - overlap_percentage)))
         
-        # Group verses by book and chapter for easier access
-        self.verses_by_book_chapter = self._group_verses_by_book_chapter()
-        
-    def _group_verses_by_book_chapter(self) -> Dict[str, Dict[int, List[Dict]]]:
-        """Group verses by book and chapter.
-        
-        Returns:
-            A nested dictionary with books as keys, chapters as sub-keys,
-            and lists of verses as values.
-        """
-        grouped = {}
-        
-        for verse in self.verses:
-            book = verse['book']
-            chapter = verse['chapter']
-            
-            if book not in grouped:
-                grouped[book] = {}
-                
-            if chapter not in grouped[book]:
-                grouped[book][chapter] = []
-                
-            grouped[book][chapter].append(verse)
-            
-        # Sort verses by verse number within each chapter
-        for book in grouped:
-            for chapter in grouped[book]:
-                grouped[book][chapter].sort(key=lambda v: v['verse'])
-                
-        return grouped
+        # Chunk constructor specialized for the fixed chunk layout
+        self._build_chunk = self._make_chunk_builder()
     
     def create_chunks(self) -> List[Dict]:
         """Create chunks using the hybrid approach.
@@ -84,128 +100,86 @@ class BibleChunker:
         Returns:
             A list of chunk objects, each containing verses, reference, and text.
         """
-        # First, create passage-level chunks
-        passage_chunks = self._create_passage_chunks()
-        logger.info(f"Created {len(passage_chunks)} passage-level chunks")
+        return list(self.iter_chunks())
+    
+    def iter_chunks(self) -> Iterator[Dict]:
+        """Yield chunks using the hybrid approach.
         
-        # Apply sliding window to large passages
-        final_chunks = []
+        Chunks are emitted as soon as their passage closes, so only one
+        passage worth of verses is held in memory at a time.
+        
+        Yields:
+            Chunk objects, each containing verses, reference, and text.
+        """
+        passage_count = 0
         large_passages = 0
+        chunk_count = 0
         
-        for chunk in passage_chunks:
-            if len(chunk['verses']) <= self.max_passage_size:
-                final_chunks.append(chunk)
+        for passage in self._iter_passages():
+            passage_count += 1
+            
+            if len(passage) <= self.max_passage_size:
+                chunk_count += 1
+                yield self._build_chunk(passage)
             else:
                 large_passages += 1
                 # Apply sliding window to this large passage
-                sliding_chunks = self._create_sliding_window_chunks(chunk['verses'])
-                final_chunks.extend(sliding_chunks)
+                for chunk in self._create_sliding_window_chunks(passage):
+                    chunk_count += 1
+                    yield chunk
         
+        logger.info(f"Created {passage_count} passage-level chunks")
         logger.info(f"Applied sliding window to {large_passages} large passages")
-        logger.info(f"Final chunk count: {len(final_chunks)}")
-        
-        return final_chunks
+        logger.info(f"Final chunk count: {chunk_count}")
     
-    def _create_passage_chunks(self) -> List[Dict]:
-        """Create chunks based on logical passages.
+    def _iter_passages(self) -> Iterator[List[Dict]]:
+        """Group the verse stream into logical passages.
         
         This method groups verses into logical passages based on narrative
-        coherence and traditional passage divisions.
+        coherence and traditional passage divisions, in a single pass over
+        the verses. Verses of a chapter must be contiguous in the stream, as
+        they are in parser output.
         
-        Returns:
-            A list of passage chunk objects.
+        Yields:
+            Lists of verses, one per passage.
         """
-        passage_chunks = []
-        current_passage = []
-        current_book = None
-        current_chapter = None
-        
-        # Process verses in order
-        for book in sorted(self.verses_by_book_chapter.keys()):
-            for chapter in sorted(self.verses_by_book_chapter[book].keys()):
-                verses = self.verses_by_book_chapter[book][chapter]
-                
-                for verse in verses:
-                    # Check for passage boundary
-                    if self._is_passage_boundary(verse, current_book, current_chapter, current_passage):
-                        # Complete current passage if it's not empty
-                        if current_passage:
-                            chunk = self._create_chunk_from_verses(current_passage)
-                            passage_chunks.append(chunk)
-                            current_passage = []
-                    
-                    # Add verse to current passage
-                    current_passage.append(verse)
-                    current_book = verse['book']
-                    current_chapter = verse['chapter']
-                
-                # Complete passage at end of chapter
-                if current_passage:
-                    chunk = self._create_chunk_from_verses(current_passage)
-                    passage_chunks.append(chunk)
-                    current_passage = []
-        
-        # Handle any remaining verses
-        if current_passage:
-            chunk = self._create_chunk_from_verses(current_passage)
-            passage_chunks.append(chunk)
-        
-        return passage_chunks
+        for _, group in groupby(self.verses, key=_get_book_chapter):
+            chapter_verses = list(group)
+            
+            # Slice the chapter between consecutive passage starts
+            bounds = self._find_passage_starts(chapter_verses)
+            bounds.append(len(chapter_verses))
+            
+            for start, end in zip(bounds, bounds[1:]):
+                yield chapter_verses[start:end]
     
-    def _is_passage_boundary(
-        self, 
-        verse: Dict, 
-        current_book: str, 
-        current_chapter: int,
-        current_passage: List[Dict]
-    ) -> bool:
-        """Determine if a verse represents a passage boundary.
+    def _find_passage_starts(self, chapter_verses: List[Dict]) -> List[int]:
+        """Find the indices of verses that start a new passage in a chapter.
+        
+        The boundary test for the whole chapter runs as one comprehension
+        rather than a method call per verse.
         
         Args:
-            verse: The current verse.
-            current_book: The book of the previous verse.
-            current_chapter: The chapter of the previous verse.
-            current_passage: The current passage being built.
+            chapter_verses: The verses of a single chapter, in order.
             
         Returns:
-            True if the verse represents a passage boundary, False otherwise.
+            Ascending indices into chapter_verses, always starting with 0.
         """
-        # Always start a new passage for a new book
-        if current_book is not None and verse['book'] != current_book:
-            return True
+        match = self._BOUNDARY_RE.match
         
-        # Always start a new passage for a new chapter
-        if current_chapter is not None and verse['chapter'] != current_chapter:
-            return True
-        
-        # If this is the first verse, it's not a boundary
-        if not current_passage:
-            return False
+        # A new book or chapter always starts a new passage
+        starts = [0]
         
         # Check for narrative or thematic shifts
         # This is a simplified approach - in a real implementation, this would
-        # involve more sophisticated analysis of the text
-        
-        # Check for verse 1, which often starts a new passage
-        if verse['verse'] == 1:
-            return True
-        
-        # Check for common passage boundary indicators in the text
-        boundary_phrases = [
-            "And it came to pass",
-            "Now it came to pass",
-            "After these things",
-            "Then",
-            "Behold",
-            "Verily, verily",
-            "Thus saith the Lord"
-        ]
-        
-        for phrase in boundary_phrases:
-            if verse['text'].startswith(phrase):
-                return True
+        # involve more sophisticated analysis of the text. Verse 1 often
+        # starts a new passage, as do common boundary phrases.
+        starts.extend(
+            i for i, verse in enumerate(chapter_verses)
+            if i and (verse['verse'] == 1 or match(verse['text']))
+        )
         
-        return False
+        return starts
     
     def _create_sliding_window_chunks(self, verses: List[Dict]) -> List[Dict]:
         """Create overlapping chunks using sliding window approach.
@@ -216,110 +190,120 @@ class BibleChunker:
         Returns:
             A list of sliding window chunk objects.
         """
-        chunks = []
-        
-        # Apply sliding window
-        for i in range(0, len(verses), self.step_size):
-            window = verses[i:i + self.window_size]
-            
-            # Only create a chunk if we have at least 2 verses
-            if len(window) >= 2:
-                chunk = self._create_chunk_from_verses(window)
-                chunks.append(chunk)
-        
-        return chunks
+        # Only create a chunk if we have at least 2 verses
+        if self.window_size < 2:
+            return []
+        
+        # Serialize each verse once; overlapping windows share the entries
+        verse_entries = _make_verse_entries(verses)
+        
+        # Apply sliding window. Windows starting at the last verse would hold
+        # a single verse, so the range stops before it.
+        window_size = self.window_size
+        return [
+            self._build_chunk(
+                verses[start:start + window_size],
+                verse_entries[start:start + window_size]
+            )
+            for start in range(0, len(verses) - 1, self.step_size)
+        ]
     
-    def _create_chunk_from_verses(self, verses: List[Dict]) -> Dict:
-        """Create a chunk object from a list of verses.
+    def _make_chunk_builder(self) -> Callable[..., Dict]:
+        """Create the function that builds a chunk object from verses.
+        
+        The chunk layout is fixed, so the builder is specialized once: the
+        field accessors and ID table are bound as closure locals, and each
+        call does no attribute lookups on the chunker.
         
-        Args:
-            verses: List of verses to include in the chunk.
-            
         Returns:
-            A chunk object containing verses, reference, and text.
+            A function that takes a list of verses, and optionally their
+            serialized entries, and returns a chunk.
         """
-        if not verses:
-            raise ValueError("Cannot create a chunk from an empty list of verses")
-        
-        # Sort verses by book, chapter, and verse
-        sorted_verses = sorted(
-            verses, 
-            key=lambda v: (v['book'], v['chapter'], v['verse'])
-        )
-        
-        # Create reference string
-        first_verse = sorted_verses[0]
-        last_verse = sorted_verses[-1]
-        
-        if first_verse['book'] == last_verse['book']:
-            if first_verse['chapter'] == last_verse['chapter']:
-                # Same book, same chapter
-                reference = f"{first_verse['book']} {first_verse['chapter']}:{first_verse['verse']}-{last_verse['verse']}"
+        get_bounds = itemgetter('book', 'chapter', 'verse')
+        get_text = _get_text
+        id_table = self._ID_TABLE
+        join = " ".join
+        make_verse_entries = _make_verse_entries
+        
+        def build_chunk(
+            verses: List[Dict],
+            verse_entries: Optional[List[Dict]] = None
+        ) -> Dict:
+            """Create a chunk object from a list of verses.
+            
+            Args:
+                verses: List of verses to include in the chunk, already in
+                    canonical order (as passages and sliding windows are).
+                verse_entries: The verses' serialized entries, if already
+                    built by the caller.
+                
+            Returns:
+                A JSON-serializable chunk object containing verses,
+                reference, and text.
+            """
+            if not verses:
+                raise ValueError("Cannot create a chunk from an empty list of verses")
+            
+            # Create reference string
+            first_verse = verses[0]
+            last_verse = verses[-1]
+            book, start_chapter, start_verse = get_bounds(first_verse)
+            end_book, end_chapter, end_verse = get_bounds(last_verse)
+            
+            # Book names are interned by the parser, so the identity check
+            # settles the usual case without comparing characters
+            if book is end_book or book == end_book:
+                if start_chapter == end_chapter:
+                    # Same book, same chapter
+                    reference = f"{book} {start_chapter}:{start_verse}-{end_verse}"
+                else:
+                    # Same book, different chapters
+                    reference = f"{book} {start_chapter}:{start_verse}-{end_chapter}:{end_verse}"
             else:
-                # Same book, different chapters
-                reference = f"{first_verse['book']} {first_verse['chapter']}:{first_verse['verse']}-{last_verse['chapter']}:{last_verse['verse']}"
-        else:
-            # Different books
-            reference = f"{first_verse['reference']}-{last_verse['reference']}"
-        
-        # Combine verse texts
-        text = " ".join([verse['text'] for verse in sorted_verses])
-        
-        # Create chunk ID
-        chunk_id = reference.lower().replace(" ", "_").replace(":", "_").replace("-", "_")
-        
-        return {
-            'chunk_id': chunk_id,
-            'verses': sorted_verses,
-            'reference': reference,
-            'text': text,
-            'metadata': {
-                'book': first_verse['book'],
-                'start_chapter': first_verse['chapter'],
-                'start_verse': first_verse['verse'],
-                'end_chapter': last_verse['chapter'],
-                'end_verse': last_verse['verse'],
-                'verse_count': len(sorted_verses)
+                # Different books
+                reference = f"{first_verse['reference']}-{last_verse['reference']}"
+            
+            # Verses keep only their reference and text, so the chunk can be
+            # serialized as-is
+            return {
+                'chunk_id': reference.lower().translate(id_table),
+                'reference': reference,
+                'text': join(map(get_text, verses)),
+                'metadata': {
+                    'book': book,
+                    'start_chapter': start_chapter,
+                    'start_verse': start_verse,
+                    'end_chapter': end_chapter,
+                    'end_verse': end_verse,
+                    'verse_count': len(verses)
+                },
+                'verses': make_verse_entries(verses) if verse_entries is None else verse_entries
             }
-        }
+        
+        return build_chunk
     
-    def save_chunks(self, chunks: List[Dict], output_path: str) -> None:
+    def save_chunks(self, chunks: Iterable[Dict], output_path: str) -> None:
         """Save chunks to a JSON file.
         
+        Chunks are written one at a time, so ``chunks`` may be the iterator
+        returned by ``iter_chunks``.
+        
         Args:
-            chunks: List of chunk objects to save.
+            chunks: Iterable of chunk objects to save.
             output_path: Path to save the chunks to.
         """
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Convert to serializable format
-        serializable_chunks = []
-        for chunk in chunks:
-            serializable_chunk = {
-                'chunk_id': chunk['chunk_id'],
-                'reference': chunk['reference'],
-                'text': chunk['text'],
-                'metadata': chunk['metadata'],
-                'verses': [
-                    {
-                        'reference': verse['reference'],
-                        'text': verse['text']
-                    }
-                    for verse in chunk['verses']
-                ]
-            }
-            serializable_chunks.append(serializable_chunk)
-        
         # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(serializable_chunks, f, indent=2)
+        chunk_count = write_json_array(chunks, output_path)
             
-        logger.info(f"Saved {len(chunks)} chunks to {output_path}")
+        logger.info(f"Saved {chunk_count} chunks to {output_path}")
+
 
 
 def create_chunks(
-    verses: List[Dict],
+    verses: Iterable[Dict],
     window_size: int = 7,
     overlap_percentage: float = 0.5,
     max_passage_size: int = 15
@@ -330,7 +314,7 @@ def create_chunks(
     and calls its create_chunks method.
     
     Args:
-        verses: List of parsed verse objects.
+        verses: Iterable of parsed verse objects in canonical order.
         window_size: Size of the sliding window in verses.
         overlap_percentage: Percentage of overlap between adjacent windows.
         max_passage_size: Maximum size of a passage chunk before applying
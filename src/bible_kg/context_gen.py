@@ -4,20 +4,267 @@ This module provides functionality to generate contextual information for Bible
 chunks using a local LLM.
 """
 
-import logging
+import hashlib
 import json
+import logging
+import sqlite3
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Deque, Dict, Iterable, List, Optional, Any, Tuple
 import os
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from .serialization import loads, write_json_array, write_json_lines
+
+# Logging is configured by the application
 logger = logging.getLogger(__name__)
 
+# Fixed instructions sent as the system prompt of every context request.
+# Keeping them byte-identical lets the LLM server reuse its KV cache for them
+# and only process the chunk-specific prompt that follows.
+SCHOLAR_SYSTEM_PROMPT = """You are a biblical scholar with extensive knowledge of the King James Bible. 
+Your task is to provide succinct contextual information for the Bible passage you are given.
+
+Please provide a brief (50-100 words) contextual description that includes:
+1. Where this passage fits in the biblical narrative
+2. Key figures or events mentioned
+3. Theological significance or themes
+4. Historical or cultural context if relevant
+
+Focus only on information that helps situate this passage within the Bible and would be useful for retrieval. 
+Do not include commentary, interpretation, or application."""
+
+# Context used when the LLM cannot be reached; never cached
+FALLBACK_CONTEXT = "Context generation failed. This passage is from the King James Bible."
+
+class ContextCache:
+    """On-disk cache of generated contexts.
+    
+    This class stores LLM responses in a SQLite database keyed by a hash of
+    the full request (model, system prompt, prompt and options), so re-runs
+    only pay for chunks whose context has not been generated before, and any
+    change to what would be sent starts from a clean slate.
+    """
+    
+    def __init__(self, cache_path: str):
+        """Initialize the ContextCache.
+        
+        Args:
+            cache_path: Path to the SQLite database file. It is created if
+                it doesn't exist.
+        """
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        
+        self.connection = sqlite3.connect(cache_path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, context TEXT NOT NULL)"
+        )
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> bytes:
+        """Create the cache key for an LLM request.
+        
+        Args:
+            request: The fields of the request that determine the response,
+                as returned by ContextGenerator._create_request.
+            
+        Returns:
+            A 16-byte BLAKE2b digest of the canonical JSON form of the
+            request.
+        """
+        return hashlib.blake2b(
+            json.dumps(request, sort_keys=True).encode('utf-8'),
+            digest_size=16
+        ).digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        """Look up a cached context, counting the hit or miss.
+        
+        Args:
+            key: Cache key from make_key.
+            
+        Returns:
+            The cached context, or None if there is no entry.
+        """
+        row = self.connection.execute(
+            "SELECT context FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return row[0]
+    
+    def set(self, key: bytes, context: str) -> None:
+        """Store a generated context.
+        
+        Args:
+            key: Cache key from make_key.
+            context: Generated context string.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, context) VALUES (?, ?)",
+                (key, context)
+            )
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.connection.close()
+
+
+class SemanticContextCache:
+    """In-memory semantic cache of generated contexts.
+    
+    This class embeds chunk texts and reuses the context of the most similar
+    earlier chunk when their cosine similarity reaches a threshold. Entries
+    are partitioned by book and chapter so that similar wording elsewhere in
+    the Bible never borrows another passage's context.
+    
+    Requires the optional embeddings dependencies (sentence-transformers and
+    faiss-cpu).
+    """
+    
+    def __init__(self, threshold: float = 0.95, model_name: str = "all-MiniLM-L6-v2"):
+        """Initialize the SemanticContextCache.
+        
+        Args:
+            threshold: Minimum cosine similarity for reusing a context.
+            model_name: Name of the sentence-transformers model used to embed
+                chunk texts.
+        """
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Semantic context caching requires the embeddings extras: "
+                "pip install -e \".[embeddings]\""
+            ) from e
+        
+        self._faiss = faiss
+        self.threshold = threshold
+        self.embedder = SentenceTransformer(model_name)
+        self.dimension = self.embedder.get_sentence_embedding_dimension()
+        
+        # (book, chapter) -> (inner-product index, contexts in index order)
+        self.partitions = {}
+        self.hits = 0
+    
+    @staticmethod
+    def partition_key(chunk: Dict) -> Tuple[str, int]:
+        """Get the book and chapter a chunk's cache entry belongs to."""
+        metadata = chunk['metadata']
+        return metadata['book'], metadata['start_chapter']
+    
+    def embed(self, chunks: List[Dict]) -> Any:
+        """Embed the texts of a list of chunks.
+        
+        Args:
+            chunks: List of chunk objects.
+            
+        Returns:
+            A float32 array of unit-length embeddings, one row per chunk.
+        """
+        return self.embedder.encode(
+            [chunk['text'] for chunk in chunks],
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ).astype('float32')
+    
+    def lookup(self, chunk: Dict, embedding: Any) -> Optional[str]:
+        """Find the context of a near-duplicate chunk.
+        
+        Args:
+            chunk: A chunk object.
+            embedding: The chunk's row from embed.
+            
+        Returns:
+            The context of the most similar cached chunk from the same book
+            and chapter, or None if none is similar enough.
+        """
+        partition = self.partitions.get(self.partition_key(chunk))
+        if partition is None:
+            return None
+        
+        index, contexts = partition
+        
+        # Embeddings are normalized, so inner product is cosine similarity
+        scores, ids = index.search(embedding.reshape(1, -1), 1)
+        if scores[0][0] < self.threshold:
+            return None
+        
+        self.hits += 1
+        return contexts[ids[0][0]]
+    
+    def add(self, chunk: Dict, embedding: Any, context: str) -> None:
+        """Store the context generated for a chunk.
+        
+        Args:
+            chunk: A chunk object.
+            embedding: The chunk's row from embed.
+            context: Generated context string.
+        """
+        partition_key = self.partition_key(chunk)
+        if partition_key not in self.partitions:
+            self.partitions[partition_key] = (self._faiss.IndexFlatIP(self.dimension), [])
+        
+        index, contexts = self.partitions[partition_key]
+        index.add(embedding.reshape(1, -1))
+        contexts.append(context)
+
+
+class RateLimiter:
+    """Thread-safe token-bucket rate limiter.
+    
+    Tokens refill continuously at the configured rate, up to one second's
+    worth, and each call takes one. Callers only wait when they would
+    exceed the rate.
+    """
+    
+    def __init__(self, rate: float):
+        """Initialize the RateLimiter.
+        
+        Args:
+            rate: Maximum number of calls per second.
+            
+        Raises:
+            ValueError: If rate is not greater than zero.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be greater than zero, got {rate}")
+        
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            
+            # Reserve the token now, so waiting callers are served in order
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+
 class ContextGenerator:
     """Generator for contextual information for Bible chunks.
     
@@ -31,56 +278,248 @@ class ContextGenerator:
         model: str = "qwen3-14b-custom",
         batch_size: int = 5,
         max_retries: int = 3,
-        retry_delay: int = 5
+        retry_delay: int = 5,
+        cache_path: Optional[str] = None,
+        semantic_cache_threshold: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        max_qps: Optional[float] = None
     ):
         """Initialize the ContextGenerator.
         
         Args:
             llm_api_url: URL of the local LLM API.
             model: Name of the model to use.
-            batch_size: Number of chunks to process in a batch.
-            max_retries: Maximum number of retries for API calls.
-            retry_delay: Delay between retries in seconds.
+            batch_size: Number of chunks embedded together for the semantic
+                cache, and the granularity of progress reports.
+            max_retries: Maximum number of retries after the first attempt of
+                an API call. Connection errors and 502, 503 and 504
+                responses are retried; other errors are not.
+            retry_delay: Backoff factor for retries, in seconds. The first
+                retry is sent immediately, and retry n >= 2 waits
+                retry_delay * 2 ** (n - 1) seconds, so the default of 5
+                waits 0, 10 and 20 seconds. Each wait is capped at 120
+                seconds.
+            cache_path: Path to an on-disk cache of generated contexts, or
+                None to disable caching.
+            semantic_cache_threshold: Minimum cosine similarity for reusing
+                the context of a near-duplicate chunk from the same chapter,
+                or None to always call the LLM. Requires the embeddings
+                extras.
+            concurrency: Maximum number of LLM requests in flight at once.
+                Defaults to the OLLAMA_NUM_PARALLEL environment variable,
+                which sets how many requests the Ollama server handles in
+                parallel, or to batch_size if it is unset.
+            max_qps: Maximum number of LLM requests started per second, or
+                None for no limit.
+            
+        Raises:
+            ValueError: If max_qps is not greater than zero.
         """
         self.llm_api_url = llm_api_url
         self.model = model
         self.batch_size = batch_size
+        
+        if concurrency is None:
+            concurrency = batch_size
+            num_parallel = os.environ.get('OLLAMA_NUM_PARALLEL')
+            
+            if num_parallel is not None:
+                try:
+                    concurrency = int(num_parallel)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid OLLAMA_NUM_PARALLEL={num_parallel!r}; using batch size {batch_size}")
+        self.concurrency = max(1, concurrency)
+
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.limiter = RateLimiter(max_qps) if max_qps is not None else None
+        self.cache = ContextCache(cache_path) if cache_path else None
+        
+        if semantic_cache_threshold is not None:
+            self.semantic_cache = SemanticContextCache(semantic_cache_threshold)
+        else:
+            self.semantic_cache = None
+        
+        # Reuse keep-alive connections to the LLM instead of opening one per
+        # call, and retry failed calls with exponential backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.concurrency,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=retry_delay,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=None
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # LLM calls spend their time waiting on I/O, so they are sent
+        # concurrently from a thread pool, up to the number of requests the
+        # server handles in parallel
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+    
+    def close(self) -> None:
+        """Close the thread pool, the HTTP session and the context cache."""
+        self.executor.shutdown()
+        self.session.close()
+        
+        if self.cache is not None:
+            self.cache.close()
         
     def generate_contexts(self, chunks: List[Dict]) -> List[Dict]:
         """Generate contextual information for a list of chunks.
         
+        Repeated chunks (same reference and text) share one LLM call, and
+        when a cache is configured, only chunks without a cached context are
+        sent. With a semantic cache, chunks that closely match an earlier
+        chunk from the same chapter reuse its context instead, and the
+        chunks of each chapter are sent one at a time, in order, so that
+        each can reuse the one before it.
+        
+        The context is added to the chunk objects in place.
+        
         Args:
             chunks: List of chunk objects.
             
         Returns:
-            List of chunks with added contextual information.
+            The same list of chunks, with added contextual information.
         """
         total_chunks = len(chunks)
         logger.info(f"Generating context for {total_chunks} chunks")
         
-        chunks_with_context = []
-        batch_count = 0
+        # Cache statistics are reported per call
+        if self.cache is not None:
+            self.cache.hits = self.cache.misses = 0
+        if self.semantic_cache is not None:
+            self.semantic_cache.hits = 0
         
-        # Process chunks in batches
-        for i in range(0, total_chunks, self.batch_size):
-            batch = chunks[i:i + self.batch_size]
-            batch_count += 1
+        # Serve what we can from the cache, and group the misses by key so
+        # each distinct request is sent to the LLM only once. The prompt
+        # includes the reference, so this only merges chunks that are
+        # repeated outright, not overlapping windows that share text.
+        pending = {}
+        for index, chunk in enumerate(chunks):
+            prompt = self._create_context_prompt(chunk['reference'], chunk['text'])
+            cache_key = ContextCache.make_key(self._create_request(prompt))
             
-            logger.info(f"Processing batch {batch_count}/{(total_chunks + self.batch_size - 1) // self.batch_size}")
+            if cache_key in pending:
+                pending[cache_key].append(index)
+                continue
             
-            # Process each chunk in the batch
-            for chunk in batch:
-                chunk_with_context = self._generate_context_for_chunk(chunk)
-                chunks_with_context.append(chunk_with_context)
+            if self.cache is not None:
+                context = self.cache.get(cache_key)
                 
-            # Add a small delay between batches to avoid overwhelming the LLM
-            if i + self.batch_size < total_chunks:
-                time.sleep(1)
+                if context is not None:
+                    self._attach_context(chunk, context)
+                    continue
+            
+            pending[cache_key] = [index]
+        
+        if self.cache is not None:
+            logger.info(f"Context cache: {self.cache.hits} hits, {self.cache.misses} misses")
+        
+        pending_keys = list(pending)
+        total_pending = len(pending_keys)
+        completed = 0
+        
+        # Report progress about every tenth of the work, in whole batches
+        progress_interval = max(1, total_pending // 10 // self.batch_size) * self.batch_size
+        
+        duplicate_count = sum(len(indices) for indices in pending.values()) - total_pending
+        if duplicate_count:
+            logger.info(f"Reusing context for {duplicate_count} repeated chunks")
+        
+        def finish(cache_key: bytes, context: str) -> None:
+            """Attach a context to every chunk sharing a key and report progress."""
+            nonlocal completed
+            
+            for index in pending[cache_key]:
+                self._attach_context(chunks[index], context)
+            
+            completed += 1
+            if completed % progress_interval == 0 or completed == total_pending:
+                logger.info(f"Generated context for {completed}/{total_pending} uncached chunks")
+        
+        # Embed the chunks batch_size at a time for the semantic cache
+        representatives = {cache_key: chunks[indices[0]] for cache_key, indices in pending.items()}
+        embeddings = {}
+        if self.semantic_cache is not None:
+            for i in range(0, total_pending, self.batch_size):
+                batch = pending_keys[i:i + self.batch_size]
+                embeddings.update(zip(
+                    batch,
+                    self.semantic_cache.embed([representatives[cache_key] for cache_key in batch])
+                ))
         
-        logger.info(f"Completed context generation for {len(chunks_with_context)} chunks")
-        return chunks_with_context
+        # A chunk can only reuse the context of a finished chunk from its own
+        # chapter, so with a semantic cache the chunks of a chapter are sent
+        # one after another, in order, and chapters run concurrently.
+        # Otherwise every chunk is independent.
+        queues: Dict[Any, Deque[bytes]] = {}
+        for cache_key in pending_keys:
+            if self.semantic_cache is not None:
+                queue_key = self.semantic_cache.partition_key(representatives[cache_key])
+            else:
+                queue_key = cache_key
+            queues.setdefault(queue_key, deque()).append(cache_key)
+        idle = deque(queues.values())
+        
+        # Keep up to `concurrency` LLM calls in flight, starting a new one as
+        # soon as any finishes
+        in_flight = {}
+        while True:
+            while idle and len(in_flight) < self.concurrency:
+                queue = idle.popleft()
+                cache_key = queue.popleft()
+                chunk = representatives[cache_key]
+                
+                # Reuse the context of a near-duplicate chunk generated earlier,
+                # and store it under this chunk's key so re-runs find it on disk
+                if self.semantic_cache is not None:
+                    context = self.semantic_cache.lookup(chunk, embeddings[cache_key])
+                    
+                    if context is not None:
+                        if self.cache is not None:
+                            self.cache.set(cache_key, context)
+                        finish(cache_key, context)
+                        
+                        if queue:
+                            idle.appendleft(queue)
+                        continue
+                
+                prompt = self._create_context_prompt(chunk['reference'], chunk['text'])
+                future = self.executor.submit(self._call_llm_api, prompt)
+                in_flight[future] = (cache_key, queue)
+            
+            if not in_flight:
+                break
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                cache_key, queue = in_flight.pop(future)
+                context = future.result()
+                
+                if context != FALLBACK_CONTEXT:
+                    if self.cache is not None:
+                        self.cache.set(cache_key, context)
+                    if self.semantic_cache is not None:
+                        self.semantic_cache.add(representatives[cache_key], embeddings[cache_key], context)
+                
+                finish(cache_key, context)
+                
+                # The next chunk of the chapter can now be looked up
+                if queue:
+                    idle.appendleft(queue)
+        
+        if self.semantic_cache is not None:
+            logger.info(f"Semantic context cache: {self.semantic_cache.hits} hits")
+        
+        logger.info(f"Completed context generation for {total_chunks} chunks")
+        return chunks
     
     def _generate_context_for_chunk(self, chunk: Dict) -> Dict:
         """Generate contextual information for a single chunk.
@@ -89,12 +528,13 @@ class ContextGenerator:
             chunk: A chunk object.
             
         Returns:
-            The chunk object with added contextual information.
+            The chunk object, updated in place with added contextual
+            information.
         """
         reference = chunk['reference']
         text = chunk['text']
         
-        logger.info(f"Generating context for chunk: {reference}")
+        logger.debug(f"Generating context for chunk: {reference}")
         
         # Create prompt for the LLM
         prompt = self._create_context_prompt(reference, text)
@@ -103,14 +543,29 @@ class ContextGenerator:
         context = self._call_llm_api(prompt)
         
         # Add context to the chunk
-        chunk_with_context = chunk.copy()
-        chunk_with_context['context'] = context
+        return self._attach_context(chunk, context)
+    
+    @staticmethod
+    def _attach_context(chunk: Dict, context: str) -> Dict:
+        """Attach generated context to a chunk, in place.
+        
+        Args:
+            chunk: A chunk object.
+            context: Generated context string.
+            
+        Returns:
+            The chunk object, with added contextual information.
+        """
+        chunk['context'] = context
         
-        return chunk_with_context
+        return chunk
     
     def _create_context_prompt(self, reference: str, text: str) -> str:
         """Create a prompt for generating contextual information.
         
+        The fixed instructions are sent separately as the system prompt, so
+        the prompt only carries the chunk itself.
+        
         Args:
             reference: Reference string for the chunk.
             text: Text of the chunk.
@@ -118,24 +573,32 @@ class ContextGenerator:
         Returns:
             A prompt string for the LLM.
         """
-        return f"""You are a biblical scholar with extensive knowledge of the King James Bible. 
-Your task is to provide succinct contextual information for the following Bible passage:
-
-Reference: {reference}
+        return f"""Reference: {reference}
 Text: {text}
 
-Please provide a brief (50-100 words) contextual description that includes:
-1. Where this passage fits in the biblical narrative
-2. Key figures or events mentioned
-3. Theological significance or themes
-4. Historical or cultural context if relevant
-
-Focus only on information that helps situate this passage within the Bible and would be useful for retrieval. 
-Do not include commentary, interpretation, or application.
-
 Contextual description:"""
     
     
+    def _create_request(self, prompt: str) -> Dict[str, Any]:
+        """Create the fields of an LLM request that determine its response.
+        
+        Args:
+            prompt: Prompt string for the LLM.
+            
+        Returns:
+            The model, system prompt, prompt and generation options.
+        """
+        return {
+            "model": self.model,
+            "system": SCHOLAR_SYSTEM_PROMPT,
+            "prompt": prompt,
+            # Ollama reads sampling parameters from options only
+            "options": {
+                "num_predict": 150,
+                "temperature": 0.7
+            }
+        }
+    
     def _call_llm_api(self, prompt: str) -> str:
         """Call the local LLM API to generate context.
         
@@ -146,75 +609,96 @@ Contextual description:"""
             Generated context string.
         """
         payload = {
-            "model": self.model,
-            "prompt": prompt,
+            **self._create_request(prompt),
             "stream": False,
-            "max_tokens": 150,
-            "temperature": 0.7
+            # Keep the model, and with it the cached system prompt, loaded
+            # between calls
+            "keep_alive": "30m"
         }
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(self.llm_api_url, json=payload)
-                response.raise_for_status()
-                
-                result = response.json()
-                return result.get('response', '').strip()
-                
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"API call failed (attempt {attempt + 1}/{self.max_retries}): {str(e)}")
-                
-                if attempt < self.max_retries - 1:
-                    logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-                else:
-                    logger.error("Max retries exceeded. Using fallback context.")
-                    return "Context generation failed. This passage is from the King James Bible."
+        if self.limiter is not None:
+            self.limiter.acquire()
         
-        # This should not be reached, but just in case
-        return "Context generation failed. This passage is from the King James Bible."
+        # Retries with backoff are handled by the session's adapter
+        try:
+            response = self.session.post(self.llm_api_url, json=payload)
+            response.raise_for_status()
+            
+            result = loads(response.content)
+            return result.get('response', '').strip()
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API call failed: {str(e)}. Using fallback context.")
+            return FALLBACK_CONTEXT
+        except ValueError as e:
+            logger.error(f"API returned malformed JSON: {str(e)}. Using fallback context.")
+            return FALLBACK_CONTEXT
     
-    def save_chunks_with_context(self, chunks: List[Dict], output_path: str) -> None:
+    @staticmethod
+    def _project(chunk: Dict) -> Dict:
+        """Project a chunk with context onto the fields that are saved.
+        
+        Args:
+            chunk: A chunk object with context.
+            
+        Returns:
+            A serializable chunk object.
+        """
+        return {
+            'chunk_id': chunk['chunk_id'],
+            'reference': chunk['reference'],
+            'text': chunk['text'],
+            'context': chunk.get('context', ''),
+            'metadata': chunk['metadata'],
+            'verses': [
+                {
+                    'reference': verse['reference'],
+                    'text': verse['text']
+                }
+                for verse in chunk['verses']
+            ]
+        }
+    
+    def save_chunks_with_context(self, chunks: Iterable[Dict], output_path: str) -> None:
         """Save chunks with context to a JSON file.
         
+        Chunks are written to the JSON array one at a time, so only the
+        chunk being written is copied.
+        
         Args:
-            chunks: List of chunk objects with context.
+            chunks: Chunk objects with context.
             output_path: Path to save the chunks to.
         """
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Convert to serializable format
-        serializable_chunks = []
-        for chunk in chunks:
-            serializable_chunk = {
-                'chunk_id': chunk['chunk_id'],
-                'reference': chunk['reference'],
-                'text': chunk['text'],
-                'context': chunk.get('context', ''),
-                'metadata': chunk['metadata'],
-                'verses': [
-                    {
-                        'reference': verse['reference'],
-                        'text': verse['text']
-                    }
-                    for verse in chunk['verses']
-                ]
-            }
-            serializable_chunks.append(serializable_chunk)
+        count = write_json_array(map(self._project, chunks), output_path)
+            
+        logger.info(f"Saved {count} chunks with context to {output_path}")
+    
+    def save_chunks_with_context_jsonl(self, chunks: Iterable[Dict], output_path: str) -> None:
+        """Save chunks with context to a JSON Lines file, one chunk per line.
+        
+        Args:
+            chunks: Chunk objects with context.
+            output_path: Path to save the chunks to.
+        """
+        # Create directory if it doesn't exist
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(serializable_chunks, f, indent=2)
+        count = write_json_lines(map(self._project, chunks), output_path)
             
-        logger.info(f"Saved {len(chunks)} chunks with context to {output_path}")
-
+        logger.info(f"Saved {count} chunks with context to {output_path}")
 
 def generate_contexts(
     chunks: List[Dict],
     llm_api_url: str = "http://localhost:11434/api/generate",
     model: str = "qwen3-14b-custom",
-    batch_size: int = 5
+    batch_size: int = 5,
+    cache_path: Optional[str] = None,
+    semantic_cache_threshold: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    max_qps: Optional[float] = None
 ) -> List[Dict]:
     """Generate contextual information for Bible chunks.
     
@@ -225,7 +709,18 @@ def generate_contexts(
         chunks: List of chunk objects.
         llm_api_url: URL of the local LLM API.
         model: Name of the model to use.
-        batch_size: Number of chunks to process in a batch.
+        batch_size: Number of chunks embedded together for the semantic
+            cache, and the granularity of progress reports.
+        cache_path: Path to an on-disk cache of generated contexts, or None
+            to disable caching.
+        semantic_cache_threshold: Minimum cosine similarity for reusing the
+            context of a near-duplicate chunk from the same chapter, or None
+            to always call the LLM.
+        concurrency: Maximum number of LLM requests in flight at once, or
+            None for the OLLAMA_NUM_PARALLEL environment variable or
+            batch_size.
+        max_qps: Maximum number of LLM requests started per second, or
+            None for no limit.
         
     Returns:
         List of chunks with added contextual information.
@@ -233,6 +728,13 @@ def generate_contexts(
     generator = ContextGenerator(
         llm_api_url=llm_api_url,
         model=model,
-        batch_size=batch_size
+        batch_size=batch_size,
+        cache_path=cache_path,
+        semantic_cache_threshold=semantic_cache_threshold,
+        concurrency=concurrency,
+        max_qps=max_qps
     )
-    return generator.generate_contexts(chunks)
+    try:
+        return generator.generate_contexts(chunks)
+    finally:
+        generator.close()
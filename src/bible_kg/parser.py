@@ -4,15 +4,16 @@ This module provides functionality to parse the King James Version (KJV) Bible
 text file into structured verse objects.
 """
 
+import mmap
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the application
 logger = logging.getLogger(__name__)
 
 class BibleParser:
@@ -22,81 +23,239 @@ class BibleParser:
     verse objects, handling special formatting and extracting metadata.
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, workers: int = 1):
         """Initialize the BibleParser.
         
         Args:
             file_path: Path to the KJV Bible text file.
+            workers: Number of processes to parse the file with. The file is
+                split into that many line-aligned byte ranges; 1 parses it in
+                the current process.
         """
         self.file_path = file_path
+        self.workers = max(1, workers)
         # Regular expression to match Bible verses in format: "Book Chapter:Verse Text"
         # This pattern captures:
         # - Book name (may contain spaces)
         # - Chapter number
         # - Verse number
         # - Verse text
-        # The pattern handles both standard format and Song of Solomon format
-        self.verse_pattern = re.compile(r'^([1-3]?\s*[A-Za-z]+(?:\s+[oO]f\s+[A-Za-z]+)?)\s+(\d+):(\d+)\s*(.+)$')
+        # The pattern handles both standard format and Song of Solomon format.
+        # It is a bytes pattern so lines are matched straight from the file
+        # buffer, and only the captured groups are decoded. The last
+        # alternative captures any other non-blank line so that it can be
+        # reported.
+        book_pattern = rb'[1-3]?[ \t]*[A-Za-z]+(?:[ \t]+[oO]f[ \t]+[A-Za-z]+)?'
+        self.verse_pattern = re.compile(
+            rb'^[ \t]*(?:(' + book_pattern + rb')[ \t]+(\d+):(\d+)[ \t]*(.*\S)|(.*\S))[ \t\r]*$'
+        )
+        self.book_pattern = re.compile(book_pattern)
+        # Raw book names seen so far, mapped to the decoded and interned name,
+        # or to None if they are not valid book names, so that each of the 66
+        # books is decoded once and all its verses share one string
+        self._books: Dict[bytes, Optional[str]] = {}
+        # Regular expression to match implied words (words in square brackets)
+        self.implied_pattern = re.compile(r'\[([^\]]+)\]')
         
-    def parse(self) -> List[Dict]:
+    def parse(self) -> Iterator[Dict[str, Any]]:
         """Parse the KJV Bible text file into structured verse objects.
         
-        Returns:
-            A list of verse objects, each containing book, chapter, verse, text,
+        Verses are yielded lazily, in file order, so callers can stream them
+        into the chunker without holding the whole Bible in memory.
+        
+        Yields:
+            Verse objects, each containing book, chapter, verse, text,
             implied_words, and reference.
         """
-        verses = []
+        verse_count = 0
         
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
+            # Memory-map the file and read it with mmap.readline, which finds
+            # line ends in C
+            with open(self.file_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                size = len(data)
+                position = 0
+                
                 # Skip header lines (first two lines)
-                next(file)
-                next(file)
+                for _ in range(2):
+                    newline = data.find(b'\n', position)
+                    position = size if newline == -1 else newline + 1
+                
+                if self.workers > 1:
+                    verses = self._parse_ranges(data, position)
+                else:
+                    verses = self._parse_range(data, position, size, position)
                 
-                line_count = 0
-                for line in file:
-                    line_count += 1
-                    line = line.strip()
-                    
-                    # Skip empty lines
-                    if not line:
-                        continue
-                    
-                    # Parse the line into a verse object
-                    verse = self._parse_line(line)
-                    if verse:
-                        verses.append(verse)
-                    else:
-                        logger.warning(f"Failed to parse line {line_count}: {line}")
+                for verse in verses:
+                    verse_count += 1
+                    yield verse
                 
-                logger.info(f"Successfully parsed {len(verses)} verses from {self.file_path}")
+                logger.info(f"Successfully parsed {verse_count} verses from {self.file_path}")
                 
         except FileNotFoundError:
             logger.error(f"File not found: {self.file_path}")
         except Exception as e:
             logger.error(f"Error parsing file: {str(e)}")
+    
+    def _parse_ranges(self, data: mmap.mmap, header_end: int) -> Iterator[Dict[str, Any]]:
+        """Parse the file body in worker processes, one byte range each.
+        
+        Args:
+            data: The memory-mapped file.
+            header_end: Offset of the first line after the header.
+            
+        Yields:
+            Verse objects, in file order.
+        """
+        size = len(data)
+        step = (size - header_end) // self.workers + 1
+        
+        # Split on line starts so that no line spans two ranges
+        starts = [header_end]
+        for _ in range(self.workers - 1):
+            newline = data.find(b'\n', starts[-1] + step)
+            if newline == -1:
+                break
+            starts.append(newline + 1)
+        ends = starts[1:] + [size]
+        
+        with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+            for verses in executor.map(
+                _parse_file_range, repeat(self.file_path), starts, ends, repeat(header_end)
+            ):
+                # Unpickled book names are fresh strings, so share them again
+                for verse in verses:
+                    verse['book'] = sys.intern(verse['book'])
+                yield from verses
+    
+    def _parse_range(self, data: mmap.mmap, start: int, end: int, header_end: int) -> Iterator[Dict[str, Any]]:
+        """Parse the lines of a byte range of the file.
+        
+        Args:
+            data: The memory-mapped file.
+            start: Offset of the first line of the range.
+            end: Offset just past the last line of the range.
+            header_end: Offset of the first line after the header, from which
+                line numbers in warnings are counted.
+            
+        Yields:
+            Verse objects, in file order.
+        """
+        # Lines are read from the mapping one at a time, so only the current
+        # line is ever copied out of the file
+        data.seek(start)
+        position = start
+        line_count = 0
+        first_line = None
+        
+        while position < end:
+            line = data.readline()
+            if not line:
+                break
+            position += len(line)
+            line_count += 1
+            line = line.rstrip(b'\n')
             
-        return verses
+            verse = self._parse_line(line)
+            if verse:
+                yield verse
+            elif line.strip():
+                # Line numbers are only needed for warnings, so the lines
+                # before the range are counted on the first one
+                if first_line is None:
+                    first_line = data[header_end:start].count(b'\n')
+                logger.warning(f"Failed to parse line {first_line + line_count}: {line.strip().decode('utf-8', 'replace')}")
     
-    def _parse_line(self, line: str) -> Optional[Dict]:
+    def parse_columns(self) -> Dict[str, Any]:
+        """Parse the KJV Bible text file into columns of verse fields.
+        
+        This is the column-oriented form of parse: one sequence per verse
+        field instead of one dict per verse, which needs about a third less
+        memory to hold the whole Bible. Chapter and verse numbers are stored
+        in compact unsigned 16-bit arrays.
+        
+        Returns:
+            A dict mapping each verse field (book, chapter, verse, text,
+            implied_words, reference) to a sequence of values, in file order.
+        """
+        columns = {
+            'book': [],
+            'chapter': array('H'),
+            'verse': array('H'),
+            'text': [],
+            'implied_words': [],
+            'reference': []
+        }
+        appenders = [(field, column.append) for field, column in columns.items()]
+        
+        for verse in self.parse():
+            for field, append in appenders:
+                append(verse[field])
+        
+        return columns
+    
+    def _parse_line(self, line: bytes) -> Optional[Dict[str, Any]]:
         """Parse a single line of text into a verse object.
         
+        The common "Book Chapter:Verse<tab>Text" shape is split with bytes
+        methods, and the verse pattern is only used for any other shape.
+        
         Args:
-            line: A line of text from the KJV Bible file.
+            line: A line of UTF-8 encoded text from the KJV Bible file.
             
         Returns:
             A verse object containing book, chapter, verse, text, implied_words,
             and reference, or None if parsing fails.
         """
+        head, tab, text = line.partition(b'\t')
+        name, _, numbers = head.rpartition(b' ')
+        chapter, _, verse = numbers.partition(b':')
+        text = text.strip(b' \t\r')
+        
+        if tab and chapter.isdigit() and verse.isdigit() and text and not text[-1:].isspace():
+            if name not in self._books:
+                # Leading whitespace is left to the verse pattern, which strips it
+                self._books[name] = (
+                    sys.intern(name.decode('utf-8'))
+                    if self.book_pattern.fullmatch(name) and not name[:1].isspace() else None
+                )
+            book = self._books[name]
+            
+            if book is not None:
+                return self._make_verse(book, int(chapter), int(verse), text.decode('utf-8'))
+        
         match = self.verse_pattern.match(line)
-        if not match:
+        if not match or match.lastindex == 5:
             return None
         
-        book = match.group(1).strip()
-        chapter = int(match.group(2))
-        verse = int(match.group(3))
-        text = match.group(4).strip()
+        # The book group always matches book_pattern, so a cached name for it
+        # is never None
+        name = match.group(1)
+        book = self._books.get(name)
+        if book is None:
+            book = self._books[name] = sys.intern(name.decode('utf-8'))
         
+        return self._make_verse(
+            book,
+            int(match.group(2)),
+            int(match.group(3)),
+            match.group(4).decode('utf-8')
+        )
+    
+    def _make_verse(self, book: str, chapter: int, verse: int, text: str) -> Dict[str, Any]:
+        """Build a verse object from its parsed fields.
+        
+        Args:
+            book: Book name.
+            chapter: Chapter number.
+            verse: Verse number.
+            text: The verse text.
+            
+        Returns:
+            A verse object containing book, chapter, verse, text, implied_words,
+            and reference.
+        """
         # Extract implied words (words in square brackets)
         implied_words = self._extract_implied_words(text)
         
@@ -122,11 +281,41 @@ class BibleParser:
             A list of implied words (words in square brackets).
         """
         # Find all words in square brackets
-        implied_pattern = re.compile(r'\[([^\]]+)\]')
-        return implied_pattern.findall(text)
+        return self.implied_pattern.findall(text)
+
+
+def _parse_file_range(file_path: str, start: int, end: int, header_end: int) -> List[Dict[str, Any]]:
+    """Parse a byte range of the KJV Bible text file in a worker process.
+    
+    Args:
+        file_path: Path to the KJV Bible text file.
+        start: Offset of the first line of the range.
+        end: Offset just past the last line of the range.
+        header_end: Offset of the first line after the header.
+        
+    Returns:
+        A list of verse objects, in file order.
+    """
+    parser = BibleParser(file_path)
+    with open(file_path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return list(parser._parse_range(data, start, end, header_end))
 
 
-def parse_bible(file_path: str) -> List[Dict]:
+def to_records(columns: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Convert verse columns back into verse objects.
+    
+    Args:
+        columns: Verse columns, as returned by BibleParser.parse_columns.
+        
+    Yields:
+        Verse objects, in column order.
+    """
+    fields = list(columns)
+    for values in zip(*columns.values()):
+        yield dict(zip(fields, values))
+
+def parse_bible(file_path: str, workers: int = 1) -> Iterator[Dict[str, Any]]:
     """Parse the KJV Bible text file into structured verse objects.
     
     This is a convenience function that creates a BibleParser instance
@@ -134,9 +323,10 @@ def parse_bible(file_path: str) -> List[Dict]:
     
     Args:
         file_path: Path to the KJV Bible text file.
+        workers: Number of processes to parse the file with.
         
     Returns:
-        A list of verse objects.
+        An iterator of verse objects, in file order.
     """
-    parser = BibleParser(file_path)
+    parser = BibleParser(file_path, workers=workers)
     return parser.parse()
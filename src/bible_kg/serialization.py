@@ -0,0 +1,110 @@
+"""JSON serialization helpers.
+
+This module provides functionality to encode and decode JSON, using orjson
+when it is installed, and to write pipeline records to JSON files
+incrementally, so that large outputs never need to be held in memory at once.
+"""
+
+import json
+from typing import Any, Iterable, Iterator
+
+try:
+    # orjson parses and serializes in C, working on UTF-8 bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable object.
+
+    Returns:
+        The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed.
+
+    Args:
+        data: The UTF-8 encoded JSON document.
+
+    Returns:
+        The parsed object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def tee_json_array(items: Iterable[Any], output_path: str) -> Iterator[Any]:
+    """Write items to a JSON array file while passing them through unchanged.
+
+    Each item is serialized as soon as it is consumed, one item per line,
+    using orjson when it is installed.
+    The closing bracket is written when the items run out or the iterator
+    is closed. If the items raise an error, the array is left open, so a
+    failed run never looks like a complete file.
+
+    Args:
+        items: Iterable of JSON-serializable objects.
+        output_path: Path to save the JSON array to.
+
+    Yields:
+        The items, in their original order.
+    """
+    with open(output_path, 'wb') as f:
+        f.write(b'[')
+        separator = b'\n'
+        try:
+            for item in items:
+                f.write(separator)
+                f.write(dumps(item))
+                separator = b',\n'
+                yield item
+        except GeneratorExit:
+            # The consumer stopped early
+            f.write(b'\n]\n')
+            raise
+        f.write(b'\n]\n')
+
+
+def write_json_array(items: Iterable[Any], output_path: str) -> int:
+    """Write items to a JSON array file incrementally.
+
+    Args:
+        items: Iterable of JSON-serializable objects.
+        output_path: Path to save the JSON array to.
+
+    Returns:
+        The number of items written.
+    """
+    count = 0
+    for _ in tee_json_array(items, output_path):
+        count += 1
+    return count
+
+
+def write_json_lines(items: Iterable[Any], output_path: str) -> int:
+    """Write items to a JSON Lines file incrementally, one item per line.
+
+    Args:
+        items: Iterable of JSON-serializable objects.
+        output_path: Path to save the JSON Lines file to.
+
+    Returns:
+        The number of items written.
+    """
+    count = 0
+    with open(output_path, 'wb') as f:
+        for item in items:
+            f.write(dumps(item))
+            f.write(b'\n')
+            count += 1
+    return count
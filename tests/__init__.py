@@ -0,0 +1 @@
+"""Bible Knowledge Graph test suite."""
@@ -0,0 +1,158 @@
+"""Tests for the Bible text chunking module."""
+
+import json
+
+import pytest
+
+from bible_kg.chunker import BibleChunker, create_chunks
+
+
+def make_verses(book: str, chapter: int, texts, start: int = 1) -> list:
+    """Build parser-shaped verse objects for consecutive verses of a chapter."""
+    return [
+        {
+            'book': book,
+            'chapter': chapter,
+            'verse': number,
+            'text': text,
+            'implied_words': [],
+            'reference': f"{book} {chapter}:{number}"
+        }
+        for number, text in enumerate(texts, start)
+    ]
+
+
+def test_iter_chunks_streams_verses():
+    consumed = []
+
+    def verses():
+        for verse in make_verses("Genesis", 1, ["One.", "Two.", "Three."]) + make_verses("Genesis", 2, ["Four."]):
+            consumed.append(verse['reference'])
+            yield verse
+
+    chunks = BibleChunker(verses()).iter_chunks()
+
+    assert next(chunks)['reference'] == "Genesis 1:1-3"
+    # The first chapter closes when the next one starts
+    assert consumed == ["Genesis 1:1", "Genesis 1:2", "Genesis 1:3", "Genesis 2:1"]
+    assert next(chunks)['reference'] == "Genesis 2:1-1"
+    assert next(chunks, None) is None
+
+
+def test_save_chunks_streams_to_json_array(tmp_path):
+    verses = make_verses("Genesis", 1, ["One.", "Two."]) + make_verses("Genesis", 2, ["Three."])
+    chunker = BibleChunker(iter(verses))
+    output_path = tmp_path / "processed" / "chunks.json"
+
+    chunker.save_chunks(chunker.iter_chunks(), str(output_path))
+
+    assert json.loads(output_path.read_text()) == create_chunks(verses)
+
+
+def test_passages_split_at_chapters_books_and_boundary_phrases():
+    verses = (
+        make_verses("Genesis", 1, [
+            "In the beginning.",
+            "And the earth.",
+            "And it came to pass, one.",
+            "Two.",
+            "Then three.",
+            "Behold, four.",
+            "Five.",
+        ])
+        + make_verses("Genesis", 2, ["Thus the heavens.", "And on the seventh day."])
+        + make_verses("Exodus", 1, ["Now these [are] the names."])
+    )
+
+    chunks = create_chunks(verses)
+
+    assert [chunk['reference'] for chunk in chunks] == [
+        "Genesis 1:1-2",
+        "Genesis 1:3-4",
+        "Genesis 1:5-5",
+        "Genesis 1:6-7",
+        "Genesis 2:1-2",
+        "Exodus 1:1-1",
+    ]
+
+
+def test_boundary_phrases_only_match_at_the_start():
+    verses = make_verses("Genesis", 1, ["One.", "Two, and it came to pass.", "Three. Behold."])
+
+    assert [chunk['reference'] for chunk in create_chunks(verses)] == ["Genesis 1:1-3"]
+
+
+def test_sliding_window_starts():
+    verses = make_verses("Psalms", 119, [f"Verse {number}." for number in range(1, 21)])
+
+    chunks = create_chunks(verses, window_size=7, overlap_percentage=0.5, max_passage_size=15)
+
+    # Windows step by 3 verses, and none starts at the last verse
+    assert [chunk['reference'] for chunk in chunks] == [
+        "Psalms 119:1-7",
+        "Psalms 119:4-10",
+        "Psalms 119:7-13",
+        "Psalms 119:10-16",
+        "Psalms 119:13-19",
+        "Psalms 119:16-20",
+        "Psalms 119:19-20",
+    ]
+
+
+def test_sliding_window_without_overlap():
+    verses = make_verses("Psalms", 119, [f"Verse {number}." for number in range(1, 18)])
+
+    chunks = create_chunks(verses, window_size=7, overlap_percentage=0, max_passage_size=15)
+
+    assert [chunk['metadata']['verse_count'] for chunk in chunks] == [7, 7, 3]
+
+
+def test_chunk_references_and_ids():
+    build_chunk = BibleChunker([])._build_chunk
+    song = make_verses("Song of Solomon", 2, ["I [am] the rose.", "As the lily."])
+    chapters = make_verses("Genesis", 1, ["Thus."], start=31) + make_verses("Genesis", 2, ["Thus the heavens."])
+    books = make_verses("Genesis", 50, ["So Joseph died."], start=26) + make_verses("Exodus", 1, ["Now these."])
+
+    assert [(chunk['reference'], chunk['chunk_id']) for chunk in map(build_chunk, [song, chapters, books])] == [
+        ("Song of Solomon 2:1-2", "song_of_solomon_2_1_2"),
+        ("Genesis 1:31-2:1", "genesis_1_31_2_1"),
+        ("Genesis 50:26-Exodus 1:1", "genesis_50_26_exodus_1_1"),
+    ]
+
+
+def test_chunk_fields():
+    verses = make_verses("Genesis", 1, ["In the beginning.", "And the earth."], start=1)
+
+    assert create_chunks(verses) == [{
+        'chunk_id': "genesis_1_1_2",
+        'reference': "Genesis 1:1-2",
+        'text': "In the beginning. And the earth.",
+        'metadata': {
+            'book': "Genesis",
+            'start_chapter': 1,
+            'start_verse': 1,
+            'end_chapter': 1,
+            'end_verse': 2,
+            'verse_count': 2
+        },
+        'verses': [
+            {'reference': "Genesis 1:1", 'text': "In the beginning."},
+            {'reference': "Genesis 1:2", 'text': "And the earth."}
+        ]
+    }]
+
+
+def test_chunk_needs_verses():
+    with pytest.raises(ValueError):
+        BibleChunker([])._build_chunk([])
+
+
+def test_sliding_windows_share_verse_entries():
+    verses = make_verses("Psalms", 119, [f"Verse {number}." for number in range(1, 21)])
+
+    first, second = create_chunks(verses, window_size=7, overlap_percentage=0.5, max_passage_size=15)[:2]
+
+    # Windows step by 3 verses, so the second starts at the first's fourth verse
+    assert second['verses'][:4] == first['verses'][3:]
+    assert all(a is b for a, b in zip(second['verses'], first['verses'][3:]))
+    assert first['verses'][0] == {'reference': "Psalms 119:1", 'text': "Verse 1."}
@@ -0,0 +1,380 @@
+"""Tests for the context generation module."""
+
+import json
+import sys
+import threading
+import types
+
+import pytest
+
+from bible_kg import context_gen
+from bible_kg.context_gen import FALLBACK_CONTEXT, ContextCache, ContextGenerator, RateLimiter
+
+
+def make_chunk(reference: str, text: str, book: str = "Genesis", chapter: int = 1) -> dict:
+    """Build a chunk with the fields context generation reads."""
+    return {
+        'reference': reference,
+        'text': text,
+        'metadata': {'book': book, 'start_chapter': chapter}
+    }
+
+
+@pytest.fixture
+def generator_factory(tmp_path, monkeypatch):
+    """Create ContextGenerators that answer from a fake LLM and record its calls."""
+    calls = []
+    lock = threading.Lock()
+    generators = []
+
+    def fake_call_llm_api(self, prompt):
+        with lock:
+            calls.append((self.model, prompt))
+        return f"{self.model}: {prompt.splitlines()[0]}"
+
+    monkeypatch.setattr(ContextGenerator, '_call_llm_api', fake_call_llm_api)
+
+    def factory(model="model-a", **kwargs):
+        kwargs.setdefault('cache_path', str(tmp_path / "cache" / "contexts.sqlite"))
+        kwargs.setdefault('concurrency', 2)
+        generator = ContextGenerator(
+            llm_api_url="http://localhost:11434/api/generate",
+            model=model,
+            **kwargs
+        )
+        generators.append(generator)
+        return generator
+
+    factory.calls = calls
+    yield factory
+
+    for generator in generators:
+        generator.close()
+
+
+def test_context_cache_round_trip(tmp_path):
+    cache_path = str(tmp_path / "nested" / "contexts.sqlite")
+    key = ContextCache.make_key({'model': "m", 'prompt': "p"})
+
+    cache = ContextCache(cache_path)
+    assert cache.get(key) is None
+    cache.set(key, "context")
+    assert cache.get(key) == "context"
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    reopened = ContextCache(cache_path)
+    try:
+        assert reopened.get(key) == "context"
+    finally:
+        reopened.close()
+
+
+def test_generate_contexts_reuses_cache(generator_factory):
+    chunks = [make_chunk("Genesis 1:1-2", "In the beginning."), make_chunk("Genesis 1:3-4", "Light.")]
+
+    first = generator_factory()
+    first.generate_contexts(chunks)
+    assert len(generator_factory.calls) == 2
+    assert (first.cache.hits, first.cache.misses) == (0, 2)
+
+    again = [dict(chunk, context=None) for chunk in chunks]
+    second = generator_factory()
+    second.generate_contexts(again)
+
+    assert len(generator_factory.calls) == 2
+    assert (second.cache.hits, second.cache.misses) == (2, 0)
+    assert [chunk['context'] for chunk in again] == [chunk['context'] for chunk in chunks]
+    assert chunks[0]['context'] == "model-a: Reference: Genesis 1:1-2"
+
+
+def test_cache_counters_are_per_call(generator_factory):
+    generator = generator_factory()
+
+    generator.generate_contexts([make_chunk("Genesis 1:1", "In the beginning.")])
+    generator.generate_contexts([make_chunk("Genesis 1:1", "In the beginning.")])
+
+    assert (generator.cache.hits, generator.cache.misses) == (1, 0)
+
+
+def test_fallback_context_is_not_cached(generator_factory, monkeypatch):
+    monkeypatch.setattr(ContextGenerator, '_call_llm_api', lambda self, prompt: FALLBACK_CONTEXT)
+    generator = generator_factory()
+
+    generator.generate_contexts([make_chunk("Genesis 1:1", "In the beginning.")])
+    generator.generate_contexts([make_chunk("Genesis 1:1", "In the beginning.")])
+
+    assert (generator.cache.hits, generator.cache.misses) == (0, 1)
+
+
+def test_duplicate_chunks_share_one_call(generator_factory):
+    chunks = [make_chunk("Genesis 1:1", "Same."), make_chunk("Genesis 1:1", "Same.")]
+
+    generator_factory(cache_path=None).generate_contexts(chunks)
+
+    assert len(generator_factory.calls) == 1
+    assert chunks[0]['context'] == chunks[1]['context']
+
+
+class FakeVector:
+    """Bag-of-words stand-in for a row of sentence-transformers embeddings."""
+
+    def __init__(self, text):
+        self.words = frozenset(text.split())
+
+    def reshape(self, *shape):
+        return [self]
+
+
+class FakeEmbeddings(list):
+    def astype(self, dtype):
+        return self
+
+
+class FakeSentenceTransformer:
+    def __init__(self, model_name):
+        pass
+
+    def get_sentence_embedding_dimension(self):
+        return 0
+
+    def encode(self, texts, convert_to_numpy, normalize_embeddings):
+        return FakeEmbeddings(FakeVector(text) for text in texts)
+
+
+class FakeIndexFlatIP:
+    """Flat index that scores rows by word overlap instead of inner product."""
+
+    def __init__(self, dimension):
+        self.rows = []
+
+    def add(self, rows):
+        self.rows.extend(rows)
+
+    def search(self, queries, k):
+        query = queries[0]
+        scores = [len(query.words & row.words) / len(query.words | row.words) for row in self.rows]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return [[scores[best]]], [[best]]
+
+
+@pytest.fixture
+def semantic_modules(monkeypatch):
+    """Install stand-ins for the optional embeddings dependencies."""
+    faiss = types.ModuleType('faiss')
+    faiss.IndexFlatIP = FakeIndexFlatIP
+    sentence_transformers = types.ModuleType('sentence_transformers')
+    sentence_transformers.SentenceTransformer = FakeSentenceTransformer
+
+    monkeypatch.setitem(sys.modules, 'faiss', faiss)
+    monkeypatch.setitem(sys.modules, 'sentence_transformers', sentence_transformers)
+
+
+def test_semantic_cache_reuses_neighbouring_window(generator_factory, semantic_modules):
+    chunks = [
+        make_chunk("Psalms 119:1-7", "a b c d e f g", "Psalms", 119),
+        make_chunk("Psalms 119:4-10", "a b c d e f h", "Psalms", 119),
+        make_chunk("Psalms 120:1-7", "a b c d e f g", "Psalms", 120),
+    ]
+
+    generator = generator_factory(semantic_cache_threshold=0.7, concurrency=4)
+    generator.generate_contexts(chunks)
+
+    # The second window reuses the first; the other chapter never does
+    assert [prompt.splitlines()[0] for _, prompt in generator_factory.calls] == [
+        "Reference: Psalms 119:1-7",
+        "Reference: Psalms 120:1-7",
+    ]
+    assert chunks[1]['context'] == chunks[0]['context']
+    assert generator.semantic_cache.hits == 1
+
+
+def test_semantic_cache_hits_are_stored_on_disk(generator_factory, semantic_modules):
+    chunks = [
+        make_chunk("Psalms 119:1-7", "a b c d e f g", "Psalms", 119),
+        make_chunk("Psalms 119:4-10", "a b c d e f h", "Psalms", 119),
+    ]
+    generator_factory(semantic_cache_threshold=0.7).generate_contexts(chunks)
+
+    again = [dict(chunk, context=None) for chunk in chunks]
+    generator = generator_factory(semantic_cache_threshold=0.7)
+    generator.generate_contexts(again)
+
+    assert len(generator_factory.calls) == 1
+    assert (generator.cache.hits, generator.cache.misses) == (2, 0)
+    assert again[1]['context'] == chunks[0]['context']
+
+
+def test_concurrency_is_independent_of_batch_size(generator_factory, monkeypatch):
+    # Every call waits until three are in flight, so this only finishes if
+    # the generator keeps three calls going with batches of two
+    barrier = threading.Barrier(3, timeout=5)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def fake_call_llm_api(self, prompt):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        barrier.wait()
+        with lock:
+            in_flight -= 1
+        return prompt
+
+    monkeypatch.setattr(ContextGenerator, '_call_llm_api', fake_call_llm_api)
+    chunks = [make_chunk(f"Genesis 1:{number}", f"Verse {number}.") for number in range(1, 7)]
+
+    generator_factory(cache_path=None, batch_size=2, concurrency=3).generate_contexts(chunks)
+
+    assert peak == 3
+    assert all(chunk['context'].startswith(f"Reference: {chunk['reference']}\n") for chunk in chunks)
+
+
+@pytest.mark.parametrize("num_parallel, concurrency", [(None, 4), ("6", 6), ("six", 4)])
+def test_concurrency_defaults_to_ollama_num_parallel(generator_factory, monkeypatch, num_parallel, concurrency):
+    if num_parallel is None:
+        monkeypatch.delenv('OLLAMA_NUM_PARALLEL', raising=False)
+    else:
+        monkeypatch.setenv('OLLAMA_NUM_PARALLEL', num_parallel)
+
+    assert generator_factory(batch_size=4, concurrency=None).concurrency == concurrency
+
+
+def test_make_key_ignores_field_order():
+    assert ContextCache.make_key({'a': 1, 'b': {'c': 2, 'd': 3}}) == \
+        ContextCache.make_key({'b': {'d': 3, 'c': 2}, 'a': 1})
+
+
+def test_same_text_with_another_reference_is_its_own_request(generator_factory):
+    chunks = [make_chunk("Genesis 1:1", "Same."), make_chunk("Genesis 1:2", "Same.")]
+
+    generator_factory(cache_path=None).generate_contexts(chunks)
+
+    assert len(generator_factory.calls) == 2
+
+
+@pytest.mark.parametrize("change", ["model", "system", "prompt", "options"])
+def test_cache_is_invalidated_by_request_changes(generator_factory, monkeypatch, change):
+    chunk = make_chunk("Genesis 1:1", "In the beginning.")
+    generator_factory().generate_contexts([dict(chunk)])
+
+    model = "model-a"
+    if change == "model":
+        model = "model-b"
+    elif change == "system":
+        monkeypatch.setattr(context_gen, 'SCHOLAR_SYSTEM_PROMPT', "Other instructions.")
+    elif change == "prompt":
+        chunk['text'] = "In the beginning God."
+    elif change == "options":
+        create_request = ContextGenerator._create_request
+
+        def hotter_request(self, prompt):
+            request = create_request(self, prompt)
+            request['options']['temperature'] = 1.0
+            return request
+
+        monkeypatch.setattr(ContextGenerator, '_create_request', hotter_request)
+
+    generator = generator_factory(model=model)
+    generator.generate_contexts([dict(chunk)])
+
+    assert len(generator_factory.calls) == 2
+    assert (generator.cache.hits, generator.cache.misses) == (0, 1)
+
+
+def test_saved_chunks_match_in_both_formats(generator_factory, tmp_path):
+    chunk = dict(
+        make_chunk("Genesis 1:1-2", "In the beginning. And the earth."),
+        chunk_id="genesis_1_1_2",
+        verses=[{'reference': "Genesis 1:1", 'text': "In the beginning."}],
+        context="Creation.",
+        extra="not saved"
+    )
+    generator = generator_factory(cache_path=None)
+    json_path = tmp_path / "out" / "chunks_with_context.json"
+    jsonl_path = tmp_path / "out" / "chunks_with_context.jsonl"
+
+    generator.save_chunks_with_context(iter([chunk]), str(json_path))
+    generator.save_chunks_with_context_jsonl(iter([chunk]), str(jsonl_path))
+
+    saved = json.loads(json_path.read_text())
+    assert saved == [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert saved == [{key: value for key, value in chunk.items() if key != 'extra'}]
+
+
+class FakeClock:
+    """Stand-in for the time module that records sleeps instead of waiting."""
+
+    def __init__(self, advance_on_sleep=True):
+        self.now = 100.0
+        self.sleeps = []
+        self.advance_on_sleep = advance_on_sleep
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.advance_on_sleep:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(context_gen, 'time', clock)
+    return clock
+
+
+def test_rate_limiter_allows_burst_then_paces(clock):
+    limiter = RateLimiter(2)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    # Two tokens are available at once, then one every half second
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_rate_limiter_refills_up_to_capacity(clock):
+    limiter = RateLimiter(2)
+    limiter.acquire()
+
+    clock.now += 60
+    for _ in range(3):
+        limiter.acquire()
+
+    assert clock.sleeps == [0.5]
+
+
+def test_rate_limiter_below_one_per_second(clock):
+    limiter = RateLimiter(0.5)
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert clock.sleeps == [2.0]
+
+
+def test_rate_limiter_queues_concurrent_callers(clock):
+    # Callers arriving at the same moment each reserve the next free slot
+    clock.advance_on_sleep = False
+    limiter = RateLimiter(2)
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert clock.sleeps == [0.5, 1.0, 1.5]
+
+
+@pytest.mark.parametrize("max_qps", [0, -1.5])
+def test_max_qps_must_be_positive(tmp_path, max_qps):
+    with pytest.raises(ValueError):
+        ContextGenerator(max_qps=max_qps, cache_path=str(tmp_path / "contexts.sqlite"))
+    # Nothing is opened before the rate is checked
+    assert not (tmp_path / "contexts.sqlite").exists()
+
+    with pytest.raises(ValueError):
+        RateLimiter(max_qps)
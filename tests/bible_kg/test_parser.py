@@ -0,0 +1,140 @@
+"""Tests for the Bible text parser module."""
+
+import logging
+
+import pytest
+
+from bible_kg.parser import BibleParser, parse_bible, to_records
+
+HEADER = "KJV\nKing James Bible: Pure Cambridge Edition\n"
+
+
+def write_bible(tmp_path, body: str) -> str:
+    """Write a KJV-style file with the two header lines and return its path."""
+    path = tmp_path / "kjv.txt"
+    path.write_bytes((HEADER + body).encode('utf-8'))
+    return str(path)
+
+
+@pytest.fixture
+def parser(tmp_path):
+    return BibleParser(write_bible(tmp_path, ""))
+
+
+def test_parse_skips_header_and_reports_bad_lines(tmp_path, caplog):
+    path = write_bible(tmp_path, (
+        "Genesis 1:1\tIn the beginning.\r\n"
+        "\n"
+        "bad line\n"
+        "Genesis 1:2\tAnd the earth.\n"
+        "Genesis 1:3"
+    ))
+
+    with caplog.at_level(logging.WARNING):
+        verses = list(parse_bible(path))
+
+    assert [verse['reference'] for verse in verses] == ["Genesis 1:1", "Genesis 1:2"]
+    assert [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING] == [
+        "Failed to parse line 3: bad line",
+        "Failed to parse line 5: Genesis 1:3",
+    ]
+
+
+def test_parse_missing_file(tmp_path, caplog):
+    path = str(tmp_path / "missing.txt")
+
+    assert list(parse_bible(path)) == []
+    assert f"File not found: {path}" in caplog.text
+
+
+def test_parse_extracts_implied_words(parser):
+    verse = parser._parse_line(b"Genesis 1:2\tdarkness [was] upon the face of [the] deep.")
+
+    assert verse['implied_words'] == ['was', 'the']
+
+
+def test_parse_columns_round_trip(tmp_path):
+    path = write_bible(tmp_path, "Genesis 1:1\tOne.\nGenesis 1:2\tTwo [words].\n")
+    parser = BibleParser(path)
+
+    columns = parser.parse_columns()
+
+    assert list(columns['chapter']) == [1, 1]
+    assert list(to_records(columns)) == list(parser.parse())
+
+
+@pytest.mark.parametrize("workers", [2, 3, 7])
+def test_parse_with_workers_matches_single_process(tmp_path, caplog, workers):
+    lines = []
+    for chapter in range(1, 30):
+        for number in range(1, 20):
+            lines.append(f"Exodus {chapter}:{number}\tVerse {number} of chapter [{chapter}].")
+        lines.append("")
+        lines.append(f"bad line {chapter}")
+    path = write_bible(tmp_path, "\n".join(lines) + "\n")
+
+    with caplog.at_level(logging.WARNING):
+        expected = list(parse_bible(path))
+        single_warnings = [record.getMessage() for record in caplog.records]
+        caplog.clear()
+
+        verses = list(parse_bible(path, workers=workers))
+
+    assert verses == expected
+    assert len({id(verse['book']) for verse in verses}) == 1
+    # Workers log from their own processes, so only check the line numbers
+    # of the single-process warnings
+    assert single_warnings[0] == "Failed to parse line 21: bad line 1"
+
+
+@pytest.mark.parametrize("line, expected", [
+    # The common shape, handled by the fast path
+    (b"Genesis 1:1\tIn the beginning God created the heaven and the earth.",
+     ("Genesis", 1, 1, "In the beginning God created the heaven and the earth.")),
+    (b"1 John 4:8\tHe that loveth not knoweth not God; for God is love.",
+     ("1 John", 4, 8, "He that loveth not knoweth not God; for God is love.")),
+    (b"Song of Solomon 2:1\tI [am] the rose of Sharon.",
+     ("Song of Solomon", 2, 1, "I [am] the rose of Sharon.")),
+    (b"Genesis 1:3\tAnd God said, Let there be light.\r",
+     ("Genesis", 1, 3, "And God said, Let there be light.")),
+    # Other shapes, handled by the regex fallback
+    (b"  Genesis 1:4\tAnd God saw the light.",
+     ("Genesis", 1, 4, "And God saw the light.")),
+    (b"Genesis 1:5 And God called the light Day.  ",
+     ("Genesis", 1, 5, "And God called the light Day.")),
+    (b"Song  of Solomon 2:2\tAs the lily among thorns.",
+     ("Song  of Solomon", 2, 2, "As the lily among thorns.")),
+])
+def test_parse_line(parser, line, expected):
+    verse = parser._parse_line(line)
+
+    book, chapter, number, text = expected
+    assert verse == {
+        'book': book,
+        'chapter': chapter,
+        'verse': number,
+        'text': text,
+        'implied_words': parser._extract_implied_words(text),
+        'reference': f"{book} {chapter}:{number}"
+    }
+
+
+@pytest.mark.parametrize("line", [
+    b"",
+    b"   \r",
+    b"not a verse",
+    b"Genesis 1:2",
+    b"Genesis 1:2\t",
+    b"Genesis x:2\tText",
+    b"Gen3sis 1:2\tText",
+])
+def test_parse_line_rejects_non_verses(parser, line):
+    assert parser._parse_line(line) is None
+
+
+def test_books_are_shared(tmp_path):
+    path = write_bible(tmp_path, "Genesis 1:1\tOne.\nGenesis 1:2\tTwo.\nGenesis 1:3 Three.\n")
+
+    first, second, third = parse_bible(path)
+
+    assert first['book'] is second['book'] is third['book']
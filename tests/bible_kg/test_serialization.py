@@ -0,0 +1,63 @@
+"""Tests for the JSON serialization helpers."""
+
+import json
+
+import pytest
+
+from bible_kg.serialization import dumps, loads, tee_json_array, write_json_array, write_json_lines
+
+ITEMS = [{'reference': "Genesis 1:1", 'text': "In the beginning."}, {'implied': ["was"]}, "é", 3]
+
+
+def test_dumps_loads_round_trip():
+    assert loads(dumps(ITEMS)) == ITEMS
+
+
+def test_tee_json_array_passes_items_through(tmp_path):
+    output_path = tmp_path / "items.json"
+
+    assert list(tee_json_array(iter(ITEMS), str(output_path))) == ITEMS
+    assert json.loads(output_path.read_text(encoding='utf-8')) == ITEMS
+
+
+def test_write_json_array_counts_items(tmp_path):
+    output_path = tmp_path / "items.json"
+
+    assert write_json_array(iter([]), str(output_path)) == 0
+    assert json.loads(output_path.read_text()) == []
+
+    assert write_json_array(ITEMS, str(output_path)) == len(ITEMS)
+    assert json.loads(output_path.read_text(encoding='utf-8')) == ITEMS
+
+
+def test_tee_json_array_closes_array_when_closed_early(tmp_path):
+    output_path = tmp_path / "items.json"
+
+    tee = tee_json_array(iter(ITEMS), str(output_path))
+    next(tee)
+    tee.close()
+
+    assert json.loads(output_path.read_text()) == ITEMS[:1]
+
+
+def test_tee_json_array_leaves_array_open_on_error(tmp_path):
+    output_path = tmp_path / "items.json"
+
+    def failing_items():
+        yield ITEMS[0]
+        raise RuntimeError("parse failed")
+
+    with pytest.raises(RuntimeError):
+        list(tee_json_array(failing_items(), str(output_path)))
+
+    with pytest.raises(ValueError):
+        json.loads(output_path.read_text())
+
+
+def test_write_json_lines(tmp_path):
+    output_path = tmp_path / "items.jsonl"
+
+    assert write_json_lines(iter(ITEMS), str(output_path)) == len(ITEMS)
+
+    lines = output_path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == ITEMS